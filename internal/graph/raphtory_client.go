@@ -76,7 +76,9 @@ func (c *RaphtoryClient) AddTransaction(ctx context.Context, tx *models.Transact
 	}
 	defer resp.Body.Close()
 
-	if resp.StatusCode != http.StatusOK && resp.StatusCode != http.StatusCreated {
+	// 202 means the service queued the transaction for a microbatch insert
+	if resp.StatusCode != http.StatusOK && resp.StatusCode != http.StatusCreated &&
+		resp.StatusCode != http.StatusAccepted {
 		return fmt.Errorf("raphtory returned status %d", resp.StatusCode)
 	}
 
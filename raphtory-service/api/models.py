@@ -2,37 +2,74 @@
 API models for Raphtory service
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 
+from graph.amounts import to_amount_units
+
 
 class TransactionInput(BaseModel):
     """Input model for adding a transaction"""
+    model_config = ConfigDict(frozen=True, populate_by_name=True, extra="ignore")
+
     tx_hash: str = Field(..., description="Transaction hash")
     from_address: str = Field(..., alias="from", description="Sender address")
     to_address: str = Field(..., alias="to", description="Receiver address")
     amount: str = Field(..., description="Transaction amount")
-    timestamp: int = Field(..., description="Unix timestamp in seconds")
-    block_number: int = Field(..., description="Block number")
+    timestamp: int = Field(..., ge=0, lt=2**63, description="Unix timestamp in seconds")
+    block_number: int = Field(..., ge=0, lt=2**63, description="Block number")
     contract: str = Field(..., description="Contract address")
 
-    class Config:
-        populate_by_name = True
+    # Amount in integer units, parsed once here and passed on to the graph
+    _amount_units: int = PrivateAttr(default=0)
+
+    @model_validator(mode="after")
+    def amount_is_decimal(self) -> "TransactionInput":
+        """Reject amounts the graph cannot store as integer units"""
+        try:
+            units = to_amount_units(self.amount)
+        except (ArithmeticError, ValueError):
+            raise ValueError("amount must be a finite decimal number")
+        if not -2**63 <= units < 2**63:
+            raise ValueError("amount is out of range")
+        self._amount_units = units
+        return self
+
+    @property
+    def amount_units(self) -> int:
+        """Amount in integer units"""
+        return self._amount_units
+
+    def to_graph_row(self) -> Dict[str, Any]:
+        """Keyword arguments for GraphManager.add_transaction, including the parsed units"""
+        row = self.model_dump()
+        row["amount_units"] = self._amount_units
+        return row
+
+
+class TransactionBatchInput(BaseModel):
+    """Input model for adding a batch of transactions"""
+    model_config = ConfigDict(frozen=True)
+
+    transactions: List[TransactionInput] = Field(
+        ...,
+        max_length=10000,
+        description="Transactions to add"
+    )
 
 
 class TransactionResponse(BaseModel):
     """Response model for a transaction"""
-    from_address: str = Field(..., alias="from")
-    to_address: str = Field(..., alias="to")
+    model_config = ConfigDict(frozen=True)
+
+    from_address: str = Field(..., serialization_alias="from")
+    to_address: str = Field(..., serialization_alias="to")
     amount: str
     tx_hash: str
     block_number: int
     timestamp: Optional[int] = None
 
-    class Config:
-        populate_by_name = True
-
 
 class NodeInfo(BaseModel):
     """Information about a graph node (address)"""
@@ -56,14 +93,13 @@ class NeighborsResponse(BaseModel):
 
 class PathsResponse(BaseModel):
     """Response for path finding query"""
-    from_address: str = Field(..., alias="from")
-    to_address: str = Field(..., alias="to")
+    model_config = ConfigDict(frozen=True)
+
+    from_address: str = Field(..., serialization_alias="from")
+    to_address: str = Field(..., serialization_alias="to")
     paths: List[List[str]]
     count: int
 
-    class Config:
-        populate_by_name = True
-
 
 class GraphStatistics(BaseModel):
     """Graph statistics"""
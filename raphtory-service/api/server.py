@@ -2,14 +2,25 @@
 FastAPI server for Raphtory temporal graph service
 """
 
-from fastapi import FastAPI, HTTPException, Query, status
+from fastapi import FastAPI, HTTPException, Query, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from typing import List, Optional
-from datetime import datetime
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime, timezone
+from functools import partial
+import asyncio
+import logging
+import os
+import time
+import orjson
 import structlog
+from anyio import to_thread
 
 from api.models import (
     TransactionInput,
+    TransactionBatchInput,
     TransactionResponse,
     NodeInfo,
     NeighborsResponse,
@@ -20,22 +31,41 @@ from api.models import (
     SuccessResponse
 )
 from graph.graph_manager import GraphManager
+from graphql_server import run_graphql_server
+from logging_config import LOG_LEVEL, configure_logging
 
 # Initialize logger
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.add_log_level,
-        structlog.processors.JSONRenderer()
-    ]
-)
+configure_logging()
 logger = structlog.get_logger()
 
+def _json_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """Serialize a response model with pydantic-core, skipping FastAPI's re-validation"""
+    return Response(
+        content=model.__pydantic_serializer__.to_json(model, by_alias=True),
+        media_type="application/json",
+        status_code=status_code
+    )
+
+
+def _success_body(message: str) -> bytes:
+    """Encode a fixed success payload once, at import"""
+    response = SuccessResponse(success=True, message=message)
+    return response.__pydantic_serializer__.to_json(response)
+
+
+# Write endpoints return one of a few constant bodies, so encode them up front
+_OK_TX_ADDED = _success_body("Transaction added successfully")
+_OK_TX_QUEUED = _success_body("Transaction queued")
+_OK_SNAPSHOT_SAVED = _success_body("Snapshot saved successfully")
+_OK_GRAPH_CLEARED = _success_body("Graph cleared successfully")
+
+
 # Initialize FastAPI app
 app = FastAPI(
     title="StableRisk Raphtory Service",
     description="Temporal graph service for USDT transaction analysis",
-    version="0.1.0"
+    version="0.1.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -47,21 +77,135 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large window, path and neighbor payloads for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Initialize graph manager
+# Cap on transactions held in the in-memory window index (0 keeps all of them)
+WINDOW_INDEX_LIMIT = int(os.getenv("WINDOW_INDEX_LIMIT", "0")) or None
 graph_manager: Optional[GraphManager] = None
 
+# Run the Raphtory GraphQL UI as a background task of this process
+GRAPHQL_UI = os.getenv("GRAPHQL_UI", "false").lower() == "true"
+graphql_task: Optional[asyncio.Task] = None
+
+# Optional microbatching of single-transaction ingest
+INGEST_MICROBATCH = os.getenv("INGEST_MICROBATCH", "false").lower() == "true"
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+INGEST_FLUSH_MS = int(os.getenv("INGEST_FLUSH_MS", "100"))
+# Requests wait for room once this many transactions are queued
+INGEST_QUEUE_SIZE = int(os.getenv("INGEST_QUEUE_SIZE", "10000"))
+
+# Worker threads for graph calls, so native Raphtory work does not block the event loop
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "200"))
+
+ingest_queue: Optional["asyncio.Queue[Dict[str, Any]]"] = None
+ingest_task: Optional[asyncio.Task] = None
+
+# Encoded /health payload, reused until its time.monotonic() expiry
+HEALTH_CACHE_TTL = 1.0
+_health_cache: Tuple[float, bytes] = (0.0, b"")
+_health_lock: Optional[asyncio.Lock] = None
+
+
+def _insert_rows(batch: List[Dict[str, Any]]) -> int:
+    """Insert transactions one at a time, returning how many failed"""
+    return sum(not graph_manager.add_transaction(**transaction) for transaction in batch)
+
+
+async def _insert_batch(batch: List[Dict[str, Any]]):
+    """Insert one batch of queued transactions off the event loop"""
+    if await to_thread.run_sync(graph_manager.add_transactions_bulk, batch):
+        return
+
+    # Clients already got 202, so keep every row the graph will accept
+    failed = await to_thread.run_sync(_insert_rows, batch)
+    logger.error(
+        "Queued transaction batch failed, inserted rows one by one",
+        count=len(batch),
+        failed=failed
+    )
+
+
+async def _drain_ingest_queue():
+    """Coalesce queued transactions into bulk graph inserts"""
+    loop = asyncio.get_running_loop()
+    batch: List[Dict[str, Any]] = []
+    insert: Optional[asyncio.Task] = None
+
+    try:
+        while True:
+            batch.append(await ingest_queue.get())
+            deadline = loop.time() + INGEST_FLUSH_MS / 1000
+
+            while len(batch) < INGEST_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(ingest_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            pending, batch = batch, []
+            # Shielded, so cancellation waits for this insert instead of repeating it
+            insert = asyncio.ensure_future(_insert_batch(pending))
+            await asyncio.shield(insert)
+
+    except asyncio.CancelledError:
+        # Let the in-flight insert finish, then flush what is still queued
+        if insert is not None:
+            await insert
+        while not ingest_queue.empty():
+            batch.append(ingest_queue.get_nowait())
+        if not graph_manager.add_transactions_bulk(batch):
+            _insert_rows(batch)
+        raise
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize graph manager on startup"""
-    global graph_manager
-    graph_manager = GraphManager(persistent=False)
+    global graph_manager, ingest_queue, ingest_task, graphql_task, _health_cache, _health_lock
+    graph_manager = GraphManager(persistent=False, window_limit=WINDOW_INDEX_LIMIT)
+    _health_cache = (0.0, b"")
+    _health_lock = asyncio.Lock()
+
+    to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+    if INGEST_MICROBATCH:
+        ingest_queue = asyncio.Queue(maxsize=INGEST_QUEUE_SIZE)
+        ingest_task = asyncio.create_task(_drain_ingest_queue())
+        logger.info(
+            "Ingest microbatching enabled",
+            batch_size=INGEST_BATCH_SIZE,
+            flush_ms=INGEST_FLUSH_MS,
+            queue_size=INGEST_QUEUE_SIZE
+        )
+
+    if GRAPHQL_UI:
+        graphql_task = asyncio.create_task(run_graphql_server(graph_manager))
+
     logger.info("Raphtory service started")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
+    if graphql_task is not None:
+        graphql_task.cancel()
+        try:
+            await graphql_task
+        except asyncio.CancelledError:
+            pass
+
+    if ingest_task is not None:
+        ingest_task.cancel()
+        try:
+            await ingest_task
+        except asyncio.CancelledError:
+            pass
+
     logger.info("Raphtory service shutting down")
 
 
@@ -72,7 +216,7 @@ async def root():
     return RedirectResponse(url="/docs")
 
 
-@app.get("/health", response_model=HealthResponse)
+@app.get("/health", response_model=None, responses={200: {"model": HealthResponse}})
 async def health_check():
     """Health check endpoint"""
     if graph_manager is None:
@@ -81,16 +225,30 @@ async def health_check():
             detail="Graph manager not initialized"
         )
 
-    stats = graph_manager.get_statistics()
-
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow().isoformat(),
-        graph_stats=GraphStatistics(**stats)
-    )
-
-
-@app.post("/graph/transaction", response_model=SuccessResponse, status_code=status.HTTP_201_CREATED)
+    global _health_cache
+    # Load balancers poll this route often and do not need per-call fresh counts
+    if time.monotonic() >= _health_cache[0]:
+        async with _health_lock:
+            # Concurrent polls wait here for one refresh instead of each computing stats
+            if time.monotonic() >= _health_cache[0]:
+                stats = await to_thread.run_sync(graph_manager.get_statistics)
+                # Statistics dicts already have GraphStatistics' shape, so skip building models
+                payload = orjson.dumps({
+                    "status": "healthy",
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                    "graph_stats": stats
+                })
+                _health_cache = (time.monotonic() + HEALTH_CACHE_TTL, payload)
+
+    return Response(content=_health_cache[1], media_type="application/json")
+
+
+@app.post(
+    "/graph/transaction",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": SuccessResponse}, 202: {"model": SuccessResponse}}
+)
 async def add_transaction(transaction: TransactionInput):
     """
     Add a transaction to the temporal graph
@@ -107,22 +265,33 @@ async def add_transaction(transaction: TransactionInput):
             detail="Graph manager not initialized"
         )
 
-    logger.info(
-        "Adding transaction",
-        tx_hash=transaction.tx_hash,
-        from_addr=transaction.from_address[:10] + "...",
-        to_addr=transaction.to_address[:10] + "..."
-    )
+    if LOG_LEVEL <= logging.INFO:
+        logger.info(
+            "Adding transaction",
+            tx_hash=transaction.tx_hash,
+            from_addr=transaction.from_address[:10] + "...",
+            to_addr=transaction.to_address[:10] + "..."
+        )
 
-    success = graph_manager.add_transaction(
+    if ingest_queue is not None:
+        await ingest_queue.put(transaction.to_graph_row())
+        return Response(
+            content=_OK_TX_QUEUED,
+            media_type="application/json",
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
+    success = await to_thread.run_sync(partial(
+        graph_manager.add_transaction,
         tx_hash=transaction.tx_hash,
         from_address=transaction.from_address,
         to_address=transaction.to_address,
         amount=transaction.amount,
+        amount_units=transaction.amount_units,
         timestamp=transaction.timestamp,
         block_number=transaction.block_number,
         contract=transaction.contract
-    )
+    ))
 
     if not success:
         raise HTTPException(
@@ -130,13 +299,56 @@ async def add_transaction(transaction: TransactionInput):
             detail="Failed to add transaction to graph"
         )
 
-    return SuccessResponse(
-        success=True,
-        message="Transaction added successfully"
+    return Response(
+        content=_OK_TX_ADDED,
+        media_type="application/json",
+        status_code=status.HTTP_201_CREATED
+    )
+
+
+@app.post(
+    "/graph/transactions",
+    response_model=None,
+    status_code=status.HTTP_201_CREATED,
+    responses={201: {"model": SuccessResponse}}
+)
+async def add_transactions_batch(batch: TransactionBatchInput):
+    """
+    Add a batch of transactions to the temporal graph in one bulk insert
+
+    Args:
+        batch: Transactions to add
+
+    Returns:
+        Success response
+    """
+    if graph_manager is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Graph manager not initialized"
+        )
+
+    success = await to_thread.run_sync(
+        graph_manager.add_transactions_bulk,
+        [transaction.to_graph_row() for transaction in batch.transactions]
     )
 
+    if not success:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to add transaction batch to graph"
+        )
+
+    return _json_response(
+        SuccessResponse(
+            success=True,
+            message=f"{len(batch.transactions)} transactions added successfully"
+        ),
+        status_code=status.HTTP_201_CREATED
+    )
 
-@app.get("/graph/node/{address}", response_model=NodeInfo)
+
+@app.get("/graph/node/{address}", response_model=None, responses={200: {"model": NodeInfo}})
 async def get_node_info(address: str):
     """
     Get information about a node (address)
@@ -153,7 +365,7 @@ async def get_node_info(address: str):
             detail="Graph manager not initialized"
         )
 
-    node_info = graph_manager.get_node_info(address)
+    node_info = await to_thread.run_sync(graph_manager.get_node_info, address)
 
     if node_info is None:
         raise HTTPException(
@@ -161,13 +373,17 @@ async def get_node_info(address: str):
             detail=f"Node not found: {address}"
         )
 
-    return NodeInfo(**node_info)
+    return _json_response(NodeInfo(**node_info))
 
 
-@app.get("/graph/window", response_model=List[TransactionResponse])
+@app.get(
+    "/graph/window",
+    response_model=None,
+    responses={200: {"model": List[TransactionResponse]}}
+)
 async def get_transactions_in_window(
-    start: int = Query(..., description="Start timestamp (Unix seconds)"),
-    end: int = Query(..., description="End timestamp (Unix seconds)"),
+    start: int = Query(..., ge=0, lt=2**63, description="Start timestamp (Unix seconds)"),
+    end: int = Query(..., ge=0, lt=2**63, description="End timestamp (Unix seconds)"),
     limit: int = Query(1000, ge=1, le=10000, description="Maximum number of transactions")
 ):
     """
@@ -193,22 +409,16 @@ async def get_transactions_in_window(
             detail="Start time must be before end time"
         )
 
-    transactions = graph_manager.get_transactions_in_window(start, end, limit)
+    transactions = await to_thread.run_sync(
+        graph_manager.get_transactions_in_window, start, end, limit
+    )
 
-    return [
-        TransactionResponse(
-            from_address=tx["from"],
-            to_address=tx["to"],
-            amount=tx["amount"],
-            tx_hash=tx["tx_hash"],
-            block_number=tx["block_number"],
-            timestamp=tx.get("timestamp")
-        )
-        for tx in transactions
-    ]
+    # The graph manager already emits dicts keyed like TransactionResponse's
+    # wire format, so they are encoded as-is without building models
+    return ORJSONResponse(transactions)
 
 
-@app.get("/graph/neighbors/{address}", response_model=NeighborsResponse)
+@app.get("/graph/neighbors/{address}", response_model=None, responses={200: {"model": NeighborsResponse}})
 async def get_neighbors(
     address: str,
     direction: str = Query("both", regex="^(in|out|both)$", description="Edge direction")
@@ -229,16 +439,16 @@ async def get_neighbors(
             detail="Graph manager not initialized"
         )
 
-    neighbors = graph_manager.get_neighbors(address, direction)
+    neighbors = await to_thread.run_sync(graph_manager.get_neighbors, address, direction)
 
-    return NeighborsResponse(
+    return _json_response(NeighborsResponse(
         address=address,
         neighbors=neighbors,
         count=len(neighbors)
-    )
+    ))
 
 
-@app.get("/graph/paths", response_model=PathsResponse)
+@app.get("/graph/paths", response_model=None, responses={200: {"model": PathsResponse}})
 async def find_paths(
     from_address: str = Query(..., alias="from", description="Start address"),
     to_address: str = Query(..., alias="to", description="End address"),
@@ -261,17 +471,17 @@ async def find_paths(
             detail="Graph manager not initialized"
         )
 
-    paths = graph_manager.find_paths(from_address, to_address, max_depth)
+    paths = await to_thread.run_sync(graph_manager.find_paths, from_address, to_address, max_depth)
 
-    return PathsResponse(
+    return _json_response(PathsResponse(
         from_address=from_address,
         to_address=to_address,
         paths=paths,
         count=len(paths)
-    )
+    ))
 
 
-@app.get("/graph/statistics", response_model=GraphStatistics)
+@app.get("/graph/statistics", response_model=None, responses={200: {"model": GraphStatistics}})
 async def get_graph_statistics():
     """Get graph statistics"""
     if graph_manager is None:
@@ -280,11 +490,11 @@ async def get_graph_statistics():
             detail="Graph manager not initialized"
         )
 
-    stats = graph_manager.get_statistics()
-    return GraphStatistics(**stats)
+    stats = await to_thread.run_sync(graph_manager.get_statistics)
+    return ORJSONResponse(stats)
 
 
-@app.post("/graph/snapshot", response_model=SuccessResponse)
+@app.post("/graph/snapshot", response_model=None, responses={200: {"model": SuccessResponse}})
 async def save_snapshot(filename: Optional[str] = None):
     """
     Save graph snapshot to disk
@@ -301,7 +511,7 @@ async def save_snapshot(filename: Optional[str] = None):
             detail="Graph manager not initialized"
         )
 
-    success = graph_manager.save_snapshot(filename)
+    success = await to_thread.run_sync(graph_manager.save_snapshot, filename)
 
     if not success:
         raise HTTPException(
@@ -309,13 +519,10 @@ async def save_snapshot(filename: Optional[str] = None):
             detail="Failed to save snapshot"
         )
 
-    return SuccessResponse(
-        success=True,
-        message="Snapshot saved successfully"
-    )
+    return Response(content=_OK_SNAPSHOT_SAVED, media_type="application/json")
 
 
-@app.delete("/graph/clear", response_model=SuccessResponse)
+@app.delete("/graph/clear", response_model=None, responses={200: {"model": SuccessResponse}})
 async def clear_graph():
     """Clear the graph (for testing only)"""
     if graph_manager is None:
@@ -324,12 +531,9 @@ async def clear_graph():
             detail="Graph manager not initialized"
         )
 
-    graph_manager.clear()
+    await to_thread.run_sync(graph_manager.clear)
 
-    return SuccessResponse(
-        success=True,
-        message="Graph cleared successfully"
-    )
+    return Response(content=_OK_GRAPH_CLEARED, media_type="application/json")
 
 
 # Error handlers
@@ -342,9 +546,12 @@ async def http_exception_handler(request, exc):
         detail=exc.detail,
         path=request.url.path
     )
-    return ErrorResponse(
-        error=exc.detail or "Internal server error",
-        detail=str(exc.status_code)
+    return _json_response(
+        ErrorResponse(
+            error=exc.detail or "Internal server error",
+            detail=str(exc.status_code)
+        ),
+        status_code=exc.status_code
     )
 
 
@@ -357,7 +564,10 @@ async def general_exception_handler(request, exc):
         path=request.url.path,
         exc_info=True
     )
-    return ErrorResponse(
-        error="Internal server error",
-        detail=str(exc)
+    return _json_response(
+        ErrorResponse(
+            error="Internal server error",
+            detail=str(exc)
+        ),
+        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
     )
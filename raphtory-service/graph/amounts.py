@@ -0,0 +1,33 @@
+"""
+Amount parsing for USDT transactions
+
+Kept free of graph dependencies so the API models can validate amounts without
+importing Raphtory.
+"""
+
+from decimal import Decimal
+
+# USDT has 6 decimals, so amounts are exact as integer micro-USDT units
+AMOUNT_DECIMALS = 6
+AMOUNT_SCALE = 10 ** AMOUNT_DECIMALS
+
+# Largest power of ten an amount can reach before its units overflow 64 bits
+AMOUNT_MAX_EXPONENT = 18 - AMOUNT_DECIMALS
+
+
+def to_amount_units(amount: str) -> int:
+    """Parse a decimal amount string into integer units"""
+    # Plain "123.45" strings become units by shifting the digits, without a Decimal
+    whole, _, fraction = amount.partition(".")
+    digits = whole[1:] if whole[:1] in ("-", "+") else whole
+    if digits.isdecimal() and (not fraction or fraction.isdecimal()):
+        return int(whole + fraction[:AMOUNT_DECIMALS].ljust(AMOUNT_DECIMALS, "0"))
+
+    # Exponents, whitespace and other forms Decimal accepts; huge exponents are
+    # rejected before scaling, which would otherwise take seconds or overflow
+    value = Decimal(amount)
+    if not value.is_finite():
+        raise ValueError(f"amount is not finite: {amount}")
+    if value.adjusted() > AMOUNT_MAX_EXPONENT:
+        raise ValueError(f"amount out of range: {amount}")
+    return int(value * AMOUNT_SCALE)
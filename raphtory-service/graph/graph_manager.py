@@ -5,29 +5,80 @@ This module manages a temporal graph of USDT transactions using Raphtory.
 Nodes represent Tron addresses, edges represent transactions with amounts and timestamps.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, FrozenSet, Tuple
+from array import array
+from bisect import bisect_left
+from collections import defaultdict, deque
 from datetime import datetime
-from decimal import Decimal
+import logging
+import operator
+import sys
+import threading
+import numpy as np
+import pandas as pd
 import structlog
 
 from raphtory import Graph, PersistentGraph
 
+from graph.amounts import AMOUNT_SCALE, to_amount_units
+from logging_config import LOG_LEVEL
+
 logger = structlog.get_logger()
 
+# (out-neighbors, in-neighbors) of an address
+NeighborSets = Tuple[FrozenSet[str], FrozenSet[str]]
+
+
+# Late rows buffered before a merge into the window index, at least; the
+# buffer may also grow to a quarter of the index
+LATE_MERGE_MIN_ROWS = 1024
+
+# Timestamps, block numbers and amount units are stored as signed 64-bit integers
+INT64_MIN = -2 ** 63
+INT64_MAX = 2 ** 63 - 1
+
+
+def _check_int64(name: str, value: int) -> int:
+    """Return value as an int, rejecting values that do not fit a 64-bit column"""
+    value = operator.index(value)
+    if not INT64_MIN <= value <= INT64_MAX:
+        raise ValueError(f"{name} out of 64-bit range: {value}")
+    return value
+
+
+def _new_node_stats() -> Dict[str, Any]:
+    """Empty running aggregates for an address"""
+    return {
+        "first_seen": None,
+        "last_seen": None,
+        "sent_count": 0,
+        "received_count": 0,
+        "sent_units": 0,
+        "received_units": 0
+    }
+
 
 class GraphManager:
     """Manages the temporal graph of USDT transactions"""
 
-    def __init__(self, persistent: bool = False, snapshot_dir: Optional[str] = None):
+    def __init__(
+        self,
+        persistent: bool = False,
+        snapshot_dir: Optional[str] = None,
+        window_limit: Optional[int] = None
+    ):
         """
         Initialize the graph manager
 
         Args:
             persistent: If True, use PersistentGraph with disk storage
             snapshot_dir: Directory for saving graph snapshots
+            window_limit: Keep at most this many of the latest transactions in the
+                window index; older windows are scanned from the graph (default: all)
         """
         self.persistent = persistent
         self.snapshot_dir = snapshot_dir or "/tmp/raphtory_snapshots"
+        self.window_limit = window_limit
 
         if persistent:
             self.graph = PersistentGraph()
@@ -37,9 +88,26 @@ class GraphManager:
             logger.info("Initialized in-memory graph")
 
         self._transaction_count = 0
-        self._node_count = 0
         self._edge_count = 0
 
+        # Per-address aggregates maintained at ingest so node info is O(1)
+        self._node_stats: Dict[str, Dict[str, Any]] = defaultdict(_new_node_stats)
+        self._stats_lock = threading.Lock()
+
+        # One shared string object per address, so set and dict lookups hit
+        # the identity fast path instead of comparing characters
+        self._addr_pool: Dict[str, str] = {}
+
+        # Integer ids for addresses, stored in the window index columns
+        self._address_ids: Dict[str, int] = {}
+        self._addresses: List[str] = []
+
+        # Transaction columns kept sorted by timestamp for window range queries
+        self._reset_transaction_index()
+
+        # Set whenever the graph changes so publishers can skip idle pushes
+        self._dirty = threading.Event()
+
     def add_transaction(
         self,
         tx_hash: str,
@@ -48,7 +116,8 @@ class GraphManager:
         amount: str,
         timestamp: int,
         block_number: int,
-        contract: str
+        contract: str,
+        amount_units: Optional[int] = None
     ) -> bool:
         """
         Add a transaction to the temporal graph
@@ -61,40 +130,40 @@ class GraphManager:
             timestamp: Unix timestamp in seconds
             block_number: Block number
             contract: Contract address
+            amount_units: Amount already parsed to integer units, if the caller has it
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Add or update nodes (addresses)
-            self._add_or_update_node(from_address, timestamp)
-            self._add_or_update_node(to_address, timestamp)
-
-            # Add edge (transaction) with temporal information
-            self.graph.add_edge(
-                timestamp,
-                from_address,
-                to_address,
-                properties={
-                    "tx_hash": tx_hash,
-                    "amount": amount,
-                    "block_number": block_number,
-                    "contract": contract
-                },
-                layer="usdt"
+            # Check every value before any write, so a bad one leaves no partial state
+            timestamp = _check_int64("timestamp", timestamp)
+            block_number = _check_int64("block_number", block_number)
+            if amount_units is None:
+                amount_units = to_amount_units(amount)
+            amount_units = _check_int64("amount_units", amount_units)
+            from_address = self._intern(from_address)
+            to_address = self._intern(to_address)
+
+            self._add_to_graph(
+                tx_hash, from_address, to_address, amount, amount_units, timestamp, block_number, contract
             )
 
-            self._transaction_count += 1
-            self._edge_count += 1
-
-            logger.debug(
-                "Transaction added to graph",
-                tx_hash=tx_hash,
-                from_addr=from_address[:10] + "...",
-                to_addr=to_address[:10] + "...",
-                amount=amount,
-                timestamp=timestamp
-            )
+            with self._stats_lock:
+                self._record_transaction(
+                    tx_hash, from_address, to_address, amount, amount_units, timestamp, block_number
+                )
+            self._dirty.set()
+
+            if LOG_LEVEL <= logging.DEBUG:
+                logger.debug(
+                    "Transaction added to graph",
+                    tx_hash=tx_hash,
+                    from_addr=from_address[:10] + "...",
+                    to_addr=to_address[:10] + "...",
+                    amount=amount,
+                    timestamp=timestamp
+                )
 
             return True
 
@@ -106,27 +175,290 @@ class GraphManager:
             )
             return False
 
-    def _add_or_update_node(self, address: str, timestamp: int):
-        """Add or update a node (address) in the graph"""
+    def _add_to_graph(
+        self,
+        tx_hash: str,
+        from_address: str,
+        to_address: str,
+        amount: str,
+        amount_units: int,
+        timestamp: int,
+        block_number: int,
+        contract: str
+    ):
+        """Write one transaction's nodes and edge to the Raphtory graph"""
+        # Add or update nodes (addresses); add_node is an idempotent upsert
+        self.graph.add_node(
+            timestamp,
+            from_address,
+            properties={"address": from_address},
+            node_type="wallet"
+        )
+        self.graph.add_node(
+            timestamp,
+            to_address,
+            properties={"address": to_address},
+            node_type="wallet"
+        )
+
+        # Add edge (transaction) with temporal information
+        self.graph.add_edge(
+            timestamp,
+            from_address,
+            to_address,
+            properties={
+                "tx_hash": tx_hash,
+                "amount": amount,
+                "amount_units": amount_units,
+                "block_number": block_number,
+                "contract": contract
+            },
+            layer="usdt"
+        )
+
+    def add_transactions_bulk(self, transactions: List[Dict[str, Any]]) -> bool:
+        """
+        Add a batch of transactions to the temporal graph in one call
+
+        Args:
+            transactions: Transaction dicts keyed like add_transaction's arguments
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not transactions:
+            return True
+
         try:
-            # Check if node exists
-            if not self.graph.has_node(address):
-                self._node_count += 1
-
-            # Add node with temporal information
-            self.graph.add_node(
-                timestamp,
-                address,
-                properties={"address": address},
-                node_type="wallet"
+            df = pd.DataFrame(transactions)
+            df["amount"] = df["amount"].astype(str)
+            # Check every row before any write, so a bad row leaves no partial state
+            # Callers that validated amounts pass the parsed units along
+            if "amount_units" in df:
+                units = df["amount_units"].tolist()
+            else:
+                units = [to_amount_units(a) for a in df["amount"]]
+            df["amount_units"] = np.array(
+                [_check_int64("amount_units", u) for u in units],
+                dtype=np.int64
             )
+            df["timestamp"] = np.array(
+                [_check_int64("timestamp", t) for t in df["timestamp"].tolist()],
+                dtype=np.int64
+            )
+            df["block_number"] = np.array(
+                [_check_int64("block_number", b) for b in df["block_number"].tolist()],
+                dtype=np.int64
+            )
+            timestamps = df["timestamp"].to_numpy()
+            from_addresses = np.array([self._intern(a) for a in df["from_address"]], dtype=object)
+            to_addresses = np.array([self._intern(a) for a in df["to_address"]], dtype=object)
+
+            nodes = pd.DataFrame({
+                "timestamp": np.concatenate([timestamps, timestamps]),
+                "address": np.concatenate([from_addresses, to_addresses])
+            })
+            self.graph.load_nodes_from_pandas(
+                nodes,
+                time="timestamp",
+                id="address",
+                node_type="wallet",
+                properties=["address"]
+            )
+            self.graph.load_edges_from_pandas(
+                df,
+                time="timestamp",
+                src="from_address",
+                dst="to_address",
+                properties=["tx_hash", "amount", "amount_units", "block_number", "contract"],
+                layer="usdt"
+            )
+
+            with self._stats_lock:
+                for row in zip(
+                    df["tx_hash"].tolist(),
+                    from_addresses.tolist(),
+                    to_addresses.tolist(),
+                    df["amount"].tolist(),
+                    df["amount_units"].tolist(),
+                    timestamps.tolist(),
+                    df["block_number"].tolist()
+                ):
+                    self._record_transaction(*row)
+            self._dirty.set()
+
+            if LOG_LEVEL <= logging.DEBUG:
+                logger.debug("Transaction batch added to graph", count=len(transactions))
+
+            return True
 
         except Exception as e:
             logger.error(
-                "Failed to add/update node",
+                "Failed to add transaction batch to graph",
                 error=str(e),
-                address=address
+                count=len(transactions)
             )
+            return False
+
+    def _reset_transaction_index(self):
+        """Create empty timestamp-sorted transaction columns and edge arrays"""
+        self._tx_times = array("q")
+        self._tx_hashes: List[str] = []
+        self._tx_src = array("i")
+        self._tx_dst = array("i")
+        self._tx_amounts: List[str] = []
+        self._tx_blocks = array("q")
+
+        # Rows older than the newest indexed timestamp, waiting to be merged in
+        self._late: List[Tuple[int, int, int, int, str, str]] = []
+
+        # Newest timestamp dropped from the window index, once it is bounded
+        self._evicted_until: Optional[int] = None
+        self._evicted_count = 0
+
+    def _record_transaction(
+        self,
+        tx_hash: str,
+        from_address: str,
+        to_address: str,
+        amount: str,
+        amount_units: int,
+        timestamp: int,
+        block_number: int
+    ):
+        """Update counters, per-address aggregates and the transaction index (caller holds _stats_lock)"""
+        src = self._address_id(from_address)
+        dst = self._address_id(to_address)
+
+        # Transactions older than the evicted range are served by the graph scan
+        if self._evicted_until is None or timestamp > self._evicted_until:
+            self._index_transaction(tx_hash, src, dst, amount, timestamp, block_number)
+
+        self._transaction_count += 1
+        self._edge_count += 1
+
+        sender = self._node_stats[from_address]
+        sender["sent_count"] += 1
+        sender["sent_units"] += amount_units
+        self._update_seen(sender, timestamp)
+
+        receiver = self._node_stats[to_address]
+        receiver["received_count"] += 1
+        receiver["received_units"] += amount_units
+        self._update_seen(receiver, timestamp)
+
+    def _index_transaction(
+        self,
+        tx_hash: str,
+        src: int,
+        dst: int,
+        amount: str,
+        timestamp: int,
+        block_number: int
+    ):
+        """Insert a transaction into the window index (caller holds _stats_lock)"""
+        # Transactions usually arrive in time order and append; late ones are
+        # buffered and merged in batches, so a backfill is not quadratic
+        if self._tx_times and timestamp < self._tx_times[-1]:
+            self._late.append((timestamp, block_number, src, dst, tx_hash, amount))
+            if len(self._late) > max(LATE_MERGE_MIN_ROWS, len(self._tx_times) // 4):
+                self._merge_late()
+        else:
+            # Typed columns first, then the lists, which cannot reject a value
+            self._tx_times.append(timestamp)
+            self._tx_blocks.append(block_number)
+            self._tx_src.append(src)
+            self._tx_dst.append(dst)
+            self._tx_hashes.append(tx_hash)
+            self._tx_amounts.append(amount)
+
+        # Evict in chunks of a quarter of the limit so deleting from the front
+        # of the columns stays amortized O(1) per transaction
+        if self.window_limit:
+            excess = len(self._tx_times) + len(self._late) - self.window_limit
+            if excess > self.window_limit // 4:
+                self._merge_late()
+                self._evict_oldest(excess)
+
+    def _merge_late(self):
+        """Merge buffered late rows into the sorted columns (caller holds _stats_lock)"""
+        if not self._late:
+            return
+
+        # Stable sort, so rows with equal timestamps keep arrival order after
+        # the indexed ones, as inserting each at bisect_right would
+        self._late.sort(key=operator.itemgetter(0))
+        times, blocks, srcs, dsts, hashes, amounts = zip(*self._late)
+        positions = np.searchsorted(
+            np.frombuffer(self._tx_times, dtype=np.int64), times, side="right"
+        )
+
+        def merge_array(column: array, values: Tuple[int, ...]) -> array:
+            merged = np.insert(np.frombuffer(column, dtype=column.typecode), positions, values)
+            return array(column.typecode, merged.tobytes())
+
+        def merge_list(column: List[str], values: Tuple[str, ...]) -> List[str]:
+            merged: List[str] = []
+            previous = 0
+            for position, value in zip(positions.tolist(), values):
+                merged.extend(column[previous:position])
+                merged.append(value)
+                previous = position
+            merged.extend(column[previous:])
+            return merged
+
+        # Build every column before replacing any, so a failure leaves the index intact
+        columns = (
+            merge_array(self._tx_times, times),
+            merge_array(self._tx_blocks, blocks),
+            merge_array(self._tx_src, srcs),
+            merge_array(self._tx_dst, dsts),
+            merge_list(self._tx_hashes, hashes),
+            merge_list(self._tx_amounts, amounts)
+        )
+        (
+            self._tx_times, self._tx_blocks, self._tx_src,
+            self._tx_dst, self._tx_hashes, self._tx_amounts
+        ) = columns
+        self._late = []
+
+    def _evict_oldest(self, count: int):
+        """Drop the oldest transactions from the window index (caller holds _stats_lock)"""
+        self._evicted_until = self._tx_times[count - 1]
+        for column in (
+            self._tx_times, self._tx_hashes, self._tx_src,
+            self._tx_dst, self._tx_amounts, self._tx_blocks
+        ):
+            del column[:count]
+        self._evicted_count += count
+
+        logger.info(
+            "Evicted transactions from window index",
+            count=count,
+            evicted_total=self._evicted_count,
+            evicted_until=self._evicted_until
+        )
+
+    def _intern(self, address: str) -> str:
+        """Return the pooled string object for an address"""
+        return self._addr_pool.setdefault(address, sys.intern(address))
+
+    def _address_id(self, address: str) -> int:
+        """Return the integer id of an address, assigning one if new (caller holds _stats_lock)"""
+        address_id = self._address_ids.get(address)
+        if address_id is None:
+            address_id = len(self._addresses)
+            self._address_ids[address] = address_id
+            self._addresses.append(address)
+        return address_id
+
+    @staticmethod
+    def _update_seen(stats: Dict[str, Any], timestamp: int):
+        """Widen an address's first/last seen range to include timestamp"""
+        if stats["first_seen"] is None or timestamp < stats["first_seen"]:
+            stats["first_seen"] = timestamp
+        if stats["last_seen"] is None or timestamp > stats["last_seen"]:
+            stats["last_seen"] = timestamp
 
     def get_node_info(self, address: str) -> Optional[Dict[str, Any]]:
         """
@@ -139,32 +471,25 @@ class GraphManager:
             Dictionary with node information, or None if not found
         """
         try:
-            if not self.graph.has_node(address):
-                return None
+            with self._stats_lock:
+                stats = self._node_stats.get(address)
+                if stats is not None:
+                    stats = dict(stats)
 
-            node = self.graph.node(address)
-
-            # Get all edges (transactions) for this node
-            out_edges = list(node.out_edges())
-            in_edges = list(node.in_edges())
+            # Every write path records the address, so no stats means no node
+            if stats is None:
+                return None
 
-            # Calculate statistics
-            total_sent = sum(
-                float(edge.properties.get("amount", 0))
-                for edge in out_edges
-            )
-            total_received = sum(
-                float(edge.properties.get("amount", 0))
-                for edge in in_edges
-            )
+            total_sent = stats["sent_units"] / AMOUNT_SCALE
+            total_received = stats["received_units"] / AMOUNT_SCALE
 
             return {
                 "address": address,
-                "first_seen": node.earliest_time if hasattr(node, 'earliest_time') else None,
-                "last_seen": node.latest_time if hasattr(node, 'latest_time') else None,
-                "transaction_count": len(out_edges) + len(in_edges),
-                "sent_count": len(out_edges),
-                "received_count": len(in_edges),
+                "first_seen": stats["first_seen"],
+                "last_seen": stats["last_seen"],
+                "transaction_count": stats["sent_count"] + stats["received_count"],
+                "sent_count": stats["sent_count"],
+                "received_count": stats["received_count"],
                 "total_sent": total_sent,
                 "total_received": total_received,
                 "balance_flow": total_received - total_sent
@@ -196,29 +521,34 @@ class GraphManager:
             List of transaction dictionaries
         """
         try:
-            # Create a windowed view of the graph
-            windowed_graph = self.graph.window(start_time, end_time)
-
-            transactions = []
-            for edge in windowed_graph.edges():
-                if len(transactions) >= limit:
-                    break
-
-                transactions.append({
-                    "from": edge.src().name,
-                    "to": edge.dst().name,
-                    "amount": edge.properties.get("amount"),
-                    "tx_hash": edge.properties.get("tx_hash"),
-                    "block_number": edge.properties.get("block_number"),
-                    "timestamp": edge.earliest_time if hasattr(edge, 'earliest_time') else None
-                })
-
-            logger.info(
-                "Retrieved transactions in window",
-                start=start_time,
-                end=end_time,
-                count=len(transactions)
-            )
+            while True:
+                # The part of the window at or before the evicted range is only in the graph
+                evicted_until = self._evicted_until
+                transactions: List[Dict[str, Any]] = []
+                index_start = start_time
+                if evicted_until is not None and start_time <= evicted_until:
+                    transactions = self._transactions_in_window_from_graph(
+                        start_time, min(end_time, evicted_until + 1), limit
+                    )
+                    index_start = evicted_until + 1
+
+                with self._stats_lock:
+                    # An eviction during the graph scan would leave a gap, so start over
+                    if self._evicted_until != evicted_until:
+                        continue
+                    if len(transactions) < limit and index_start < end_time:
+                        transactions += self._transactions_in_window_from_index(
+                            index_start, end_time, limit - len(transactions)
+                        )
+                break
+
+            if LOG_LEVEL <= logging.INFO:
+                logger.info(
+                    "Retrieved transactions in window",
+                    start=start_time,
+                    end=end_time,
+                    count=len(transactions)
+                )
 
             return transactions
 
@@ -231,6 +561,66 @@ class GraphManager:
             )
             return []
 
+    def _transactions_in_window_from_index(
+        self,
+        start_time: int,
+        end_time: int,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Read a window from the timestamp-sorted columns (caller holds _stats_lock)"""
+        self._merge_late()
+
+        # Binary search the window bounds, then emit the slice in time order
+        lo = bisect_left(self._tx_times, start_time)
+        hi = min(bisect_left(self._tx_times, end_time), lo + limit)
+        addresses = self._addresses
+
+        # Slice each column once and zip the rows back together
+        return [
+            {
+                "from": addresses[src],
+                "to": addresses[dst],
+                "amount": amount,
+                "tx_hash": tx_hash,
+                "block_number": block_number,
+                "timestamp": timestamp
+            }
+            for src, dst, amount, tx_hash, block_number, timestamp in zip(
+                self._tx_src[lo:hi],
+                self._tx_dst[lo:hi],
+                self._tx_amounts[lo:hi],
+                self._tx_hashes[lo:hi],
+                self._tx_blocks[lo:hi],
+                self._tx_times[lo:hi]
+            )
+        ]
+
+    def _transactions_in_window_from_graph(
+        self,
+        start_time: int,
+        end_time: int,
+        limit: int
+    ) -> List[Dict[str, Any]]:
+        """Scan a windowed view of the graph for transactions not in the index"""
+        windowed_graph = self.graph.window(start_time, end_time)
+
+        # Explode so repeat transfers between the same pair are returned individually
+        transactions = [
+            {
+                "from": edge.src.name,
+                "to": edge.dst.name,
+                "amount": edge.properties.get("amount"),
+                "tx_hash": edge.properties.get("tx_hash"),
+                "block_number": edge.properties.get("block_number"),
+                "timestamp": edge.time
+            }
+            for edge in windowed_graph.edges.explode()
+        ]
+
+        # Edges come back grouped by pair, so order by time before applying the limit
+        transactions.sort(key=lambda tx: tx["timestamp"])
+        return transactions[:limit]
+
     def get_neighbors(
         self,
         address: str,
@@ -254,12 +644,10 @@ class GraphManager:
             neighbors = set()
 
             if direction in ("out", "both"):
-                for edge in node.out_edges():
-                    neighbors.add(edge.dst().name)
+                neighbors.update(map(self._intern, node.out_neighbours.name))
 
             if direction in ("in", "both"):
-                for edge in node.in_edges():
-                    neighbors.add(edge.src().name)
+                neighbors.update(map(self._intern, node.in_neighbours.name))
 
             return list(neighbors)
 
@@ -271,6 +659,39 @@ class GraphManager:
             )
             return []
 
+    def _neighbor_sets(self, address: str, cache: Dict[str, NeighborSets]) -> NeighborSets:
+        """Return (out, in) neighbor names for an address, memoized in cache"""
+        sets = cache.get(address)
+        if sets is None:
+            node = self.graph.node(address)
+            sets = (
+                frozenset(map(self._intern, node.out_neighbours.name)),
+                frozenset(map(self._intern, node.in_neighbours.name))
+            )
+            cache[address] = sets
+        return sets
+
+    @staticmethod
+    def _trace(
+        parents: Dict[str, List[str]],
+        address: str,
+        memo: Dict[str, List[List[str]]]
+    ) -> List[List[str]]:
+        """Expand a BFS parent map into every path from the search root to address"""
+        # Paths through a shared ancestor are expanded once and reused
+        paths = memo.get(address)
+        if paths is None:
+            if not parents[address]:
+                paths = [[address]]
+            else:
+                paths = [
+                    path + [address]
+                    for parent in parents[address]
+                    for path in GraphManager._trace(parents, parent, memo)
+                ]
+            memo[address] = paths
+        return paths
+
     def find_paths(
         self,
         from_address: str,
@@ -278,41 +699,72 @@ class GraphManager:
         max_depth: int = 3
     ) -> List[List[str]]:
         """
-        Find paths between two addresses
+        Find the shortest paths between two addresses
+
+        Runs a bidirectional BFS, expanding the smaller of the forward
+        (out-neighbors) and backward (in-neighbors) frontiers until they meet.
 
         Args:
             from_address: Start address
             to_address: End address
-            max_depth: Maximum path length
+            max_depth: Maximum path length (number of addresses in a path)
 
         Returns:
             List of paths (each path is a list of addresses)
         """
         try:
-            if not self.graph.has_node(from_address) or not self.graph.has_node(to_address):
+            if from_address == to_address:
                 return []
 
-            # Simple BFS to find paths
-            paths = []
-            queue = [([from_address], set([from_address]))]
-
-            while queue:
-                current_path, visited = queue.pop(0)
-                current_node = current_path[-1]
-
-                if len(current_path) > max_depth:
-                    continue
+            if not self.graph.has_node(from_address) or not self.graph.has_node(to_address):
+                return []
 
-                if current_node == to_address and len(current_path) > 1:
-                    paths.append(current_path)
-                    continue
+            neighbor_cache: Dict[str, NeighborSets] = {}
+            max_hops = max_depth - 1
+
+            # Parent maps hold every predecessor on a shortest path, so all
+            # shortest paths can be rebuilt once the frontiers meet
+            forward_parents: Dict[str, List[str]] = {from_address: []}
+            backward_parents: Dict[str, List[str]] = {to_address: []}
+            forward_frontier = deque([from_address])
+            backward_frontier = deque([to_address])
+            hops = 0
+            meeting: List[str] = []
+
+            while forward_frontier and backward_frontier and hops < max_hops:
+                forward = len(forward_frontier) <= len(backward_frontier)
+                if forward:
+                    frontier, parents, other_parents = forward_frontier, forward_parents, backward_parents
+                else:
+                    frontier, parents, other_parents = backward_frontier, backward_parents, forward_parents
+
+                level: Dict[str, List[str]] = {}
+                for _ in range(len(frontier)):
+                    current_node = frontier.popleft()
+                    out_neighbors, in_neighbors = self._neighbor_sets(current_node, neighbor_cache)
+                    for neighbor in (out_neighbors if forward else in_neighbors):
+                        if neighbor in parents:
+                            continue
+                        if neighbor not in level:
+                            level[neighbor] = []
+                            frontier.append(neighbor)
+                        level[neighbor].append(current_node)
+
+                parents.update(level)
+                hops += 1
+
+                meeting = [node for node in level if node in other_parents]
+                if meeting:
+                    break
 
-                # Explore neighbors
-                for neighbor in self.get_neighbors(current_node, direction="out"):
-                    if neighbor not in visited:
-                        new_path = current_path + [neighbor]
-                        new_visited = visited | {neighbor}
-                        queue.append((new_path, new_visited))
+            paths = []
+            forward_memo: Dict[str, List[List[str]]] = {}
+            backward_memo: Dict[str, List[List[str]]] = {}
+            for node in sorted(meeting):
+                suffixes = self._trace(backward_parents, node, backward_memo)
+                for prefix in self._trace(forward_parents, node, forward_memo):
+                    for suffix in suffixes:
+                        paths.append(prefix + suffix[-2::-1])
 
             return paths
 
@@ -339,9 +791,11 @@ class GraphManager:
         except Exception as e:
             logger.error("Failed to get statistics", error=str(e))
             return {
-                "node_count": self._node_count,
+                "node_count": len(self._node_stats),
                 "edge_count": self._edge_count,
                 "transaction_count": self._transaction_count,
+                "earliest_time": None,
+                "latest_time": None,
                 "persistent": self.persistent
             }
 
@@ -371,6 +825,21 @@ class GraphManager:
             logger.error("Failed to save snapshot", error=str(e))
             return False
 
+    def wait_for_changes(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the graph changes, then reset the change flag
+
+        Args:
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            True if the graph changed since the last call, False on timeout
+        """
+        if not self._dirty.wait(timeout):
+            return False
+        self._dirty.clear()
+        return True
+
     def clear(self):
         """Clear the graph (for testing)"""
         if self.persistent:
@@ -378,8 +847,15 @@ class GraphManager:
         else:
             self.graph = Graph()
 
-        self._transaction_count = 0
-        self._node_count = 0
-        self._edge_count = 0
+        with self._stats_lock:
+            self._transaction_count = 0
+            self._edge_count = 0
+            self._node_stats.clear()
+
+            self._addr_pool = {}
+            self._address_ids = {}
+            self._addresses = []
+            self._reset_transaction_index()
+        self._dirty.set()
 
         logger.info("Graph cleared")
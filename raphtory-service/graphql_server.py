@@ -1,84 +1,103 @@
 """
 GraphQL Server for Raphtory UI
 
-This module starts the Raphtory GraphQL server with built-in UI
-for interactive graph exploration and visualization.
+This module runs the Raphtory GraphQL server with built-in UI for interactive
+graph exploration and visualization. It runs as a background task inside the
+API process, so it publishes the same graph the REST endpoints write to.
+
+The graph is cached into the server's working directory and only new updates
+are appended to that file; the server reloads it once its in-memory copy has
+been idle for GRAPHQL_CACHE_TTI seconds.
 """
 
+import asyncio
 import os
+import shutil
 import structlog
+from anyio import to_thread
 from raphtory import graphql
 
 logger = structlog.get_logger()
 
+# Name the graph is served under
+GRAPH_PATH = "usdt_transactions"
+
+# Seconds to let a burst of writes settle before appending them
+PUSH_DEBOUNCE = 0.5
+
+# Longest a change wait blocks its worker thread, which bounds shutdown delay
+CHANGE_WAIT_TIMEOUT = 1.0
+
+
+def _cache_graph(graph, path):
+    """Write the whole graph to the server's working directory and track later updates"""
+    # Raphtory refuses to cache into a non-empty folder
+    shutil.rmtree(path, ignore_errors=True)
+    graph.cache(path)
+
 
-def start_graphql_server(graph_manager):
+async def run_graphql_server(graph_manager):
     """
-    Start the Raphtory GraphQL server with UI
+    Run the Raphtory GraphQL server with UI, appending graph updates to its cache file
 
     Args:
         graph_manager: The GraphManager instance containing the graph
     """
     port = int(os.getenv("GRAPHQL_PORT", "1736"))
     work_dir = os.getenv("GRAPHQL_WORK_DIR", "/tmp/raphtory_graphql")
+    cache_tti = int(os.getenv("GRAPHQL_CACHE_TTI", "5"))
+    graph_path = os.path.join(work_dir, GRAPH_PATH)
+    log = logger.bind(component="graphql")
 
-    logger.info(
-        "Starting Raphtory GraphQL server with UI",
-        port=port,
-        work_dir=work_dir
-    )
+    log.info("Starting Raphtory GraphQL server with UI", port=port, work_dir=work_dir)
 
     try:
         # Create working directory if it doesn't exist
         os.makedirs(work_dir, exist_ok=True)
 
-        # Create GraphQL server with working directory
+        graph = graph_manager.graph
+        await to_thread.run_sync(_cache_graph, graph, graph_path)
+
         # The UI will be available at http://localhost:{port}/
         # The GraphQL playground will be at http://localhost:{port}/playground
-        server = graphql.GraphServer(work_dir)
-
-        # Start the server (non-blocking) and get client
-        handle = server.start(port=port)
-        client = handle.get_client()
-
-        # Send the graph to the server
-        # This makes it available in the UI
-        if graph_manager and graph_manager.graph:
-            client.send_graph(
-                name="usdt_transactions",
-                graph=graph_manager.graph,
-                overwrite=True
-            )
-            logger.info(
-                "Graph sent to GraphQL server",
-                name="usdt_transactions"
-            )
-        else:
-            logger.warning("Graph manager or graph not available, UI will be empty")
-
-        logger.info(
-            "GraphQL server started successfully",
-            port=port,
-            ui_url=f"http://localhost:{port}/",
-            playground_url=f"http://localhost:{port}/playground"
-        )
-
-        # Keep the thread alive
-        import time
-        while True:
-            time.sleep(60)
-            # Periodically update the graph in case new transactions arrived
-            if graph_manager and graph_manager.graph:
-                client.send_graph(
-                    name="usdt_transactions",
-                    graph=graph_manager.graph,
-                    overwrite=True
-                )
+        server = graphql.GraphServer(work_dir, cache_tti_seconds=cache_tti)
+        handle = await to_thread.run_sync(lambda: server.start(port=port))
 
     except Exception as e:
-        logger.error(
-            "Failed to start GraphQL server",
-            error=str(e),
-            exc_info=True
-        )
-        raise
+        log.error("Failed to start GraphQL server", error=str(e), exc_info=True)
+        return
+
+    log.info(
+        "GraphQL server started successfully",
+        port=port,
+        ui_url=f"http://localhost:{port}/",
+        playground_url=f"http://localhost:{port}/playground"
+    )
+
+    try:
+        while True:
+            changed = await to_thread.run_sync(
+                graph_manager.wait_for_changes,
+                CHANGE_WAIT_TIMEOUT,
+                abandon_on_cancel=True
+            )
+            if not changed:
+                continue
+
+            await asyncio.sleep(PUSH_DEBOUNCE)
+            # Writes that landed during the debounce are covered by this write
+            graph_manager.wait_for_changes(timeout=0)
+
+            try:
+                if graph_manager.graph is graph:
+                    await to_thread.run_sync(graph.write_updates)
+                else:
+                    # The graph was replaced (e.g. cleared), so start a new cache file
+                    graph = graph_manager.graph
+                    await to_thread.run_sync(_cache_graph, graph, graph_path)
+                log.debug("Graph updated in UI")
+            except Exception as e:
+                log.error("Failed to update graph in UI", error=str(e))
+
+    finally:
+        handle.stop()
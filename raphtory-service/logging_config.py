@@ -0,0 +1,106 @@
+"""
+Logging configuration for Raphtory service
+
+structlog stamps each event in the calling thread and puts the event dict on a
+queue; a QueueListener thread renders it to JSON bytes with orjson and writes
+it to stdout. Events below LOG_LEVEL are dropped before any processing.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueListener
+from typing import Any, Dict, Optional
+import orjson
+import structlog
+
+# Hot paths compare against this before logging, so filtered-out calls do not
+# build their arguments
+LOG_LEVEL = getattr(logging, os.getenv("LOG_LEVEL", "info").upper(), logging.INFO)
+
+_queue: "queue.SimpleQueue[Dict[str, Any]]" = queue.SimpleQueue()
+_listener: Optional[QueueListener] = None
+
+
+class QueueLogger:
+    """structlog logger that hands event dicts to the listener thread"""
+
+    def msg(self, **event_dict: Any) -> None:
+        _queue.put(event_dict)
+
+    log = debug = info = warn = warning = msg
+    fatal = failure = err = error = critical = exception = msg
+
+
+def _render(event_dict: Dict[str, Any]) -> bytes:
+    """Encode an event dict as one JSON line"""
+    try:
+        return orjson.dumps(event_dict, default=repr) + b"\n"
+    except TypeError:
+        # orjson rejects some values outright (e.g. integers over 64 bits or
+        # non-string keys); an error here would kill the listener thread, so
+        # fall back to the repr of every non-string value
+        return orjson.dumps({
+            str(key): value if isinstance(value, str) else repr(value)
+            for key, value in event_dict.items()
+        }) + b"\n"
+
+
+class _JSONWriter:
+    """QueueListener handler that renders event dicts and writes them to stdout"""
+
+    def handle(self, event_dict: Dict[str, Any]) -> None:
+        # Look stdout up per event, as it can be swapped (e.g. by pytest capture)
+        sys.stdout.buffer.write(_render(event_dict))
+        # Flush once per burst of queued events rather than once per line
+        if _queue.empty():
+            sys.stdout.buffer.flush()
+
+    def flush(self) -> None:
+        sys.stdout.buffer.flush()
+
+
+def _start_listener():
+    """Start a listener thread draining the log queue"""
+    global _listener
+    _listener = QueueListener(_queue, _JSONWriter())
+    _listener.start()
+
+
+def _stop_listener():
+    """Write out queued events and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.flush()
+        _listener = None
+
+
+def configure_logging():
+    """Configure structlog once per process"""
+    if structlog.is_configured():
+        return
+
+    structlog.configure(
+        processors=[
+            structlog.processors.TimeStamper(fmt="iso", utc=True),
+            structlog.processors.add_log_level,
+            structlog.processors.format_exc_info
+        ],
+        wrapper_class=structlog.make_filtering_bound_logger(LOG_LEVEL),
+        logger_factory=lambda *args: QueueLogger(),
+        cache_logger_on_first_use=True
+    )
+
+    _start_listener()
+    atexit.register(_stop_listener)
+    # Threads do not survive fork (e.g. gunicorn --preload), so drain the queue
+    # before forking and run a listener on each side
+    os.register_at_fork(
+        before=_stop_listener,
+        after_in_parent=_start_listener,
+        after_in_child=_start_listener
+    )
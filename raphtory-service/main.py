@@ -5,35 +5,51 @@ Starts both the FastAPI REST server and GraphQL server with UI
 """
 
 import os
+import signal
+import socket
+import subprocess
 import sys
 import structlog
 import uvicorn
-import threading
-import time
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-structlog.configure(
-    processors=[
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.add_log_level,
-        structlog.processors.JSONRenderer()
-    ]
-)
+# Imported after load_dotenv so LOG_LEVEL from .env applies
+from logging_config import configure_logging  # noqa: E402
+
+configure_logging()
 
 logger = structlog.get_logger()
 
+# Prefer the uvloop event loop and httptools parser, falling back to uvicorn's
+# defaults where they are not installed (uvloop has no Windows build)
+try:
+    import uvloop  # noqa: F401
+    UVICORN_LOOP = "uvloop"
+except ImportError:
+    UVICORN_LOOP = "auto"
+
+try:
+    import httptools  # noqa: F401
+    UVICORN_HTTP = "httptools"
+except ImportError:
+    UVICORN_HTTP = "auto"
+
 
-def run_fastapi_server():
-    """Run the FastAPI REST server"""
+def run_fastapi_server(dev: bool = False):
+    """
+    Run the FastAPI REST server
+
+    Args:
+        dev: If True, enable auto-reload regardless of RELOAD
+    """
     host = os.getenv("HOST", "0.0.0.0")
     port = int(os.getenv("PORT", "8000"))
     log_level = os.getenv("LOG_LEVEL", "info").lower()
     workers = int(os.getenv("WORKERS", "1"))
-    reload = os.getenv("RELOAD", "false").lower() == "true"
+    reload = dev or os.getenv("RELOAD", "false").lower() == "true"
 
     logger.info(
         "Starting FastAPI REST server",
@@ -41,7 +57,9 @@ def run_fastapi_server():
         port=port,
         log_level=log_level,
         workers=workers,
-        reload=reload
+        reload=reload,
+        loop=UVICORN_LOOP,
+        http=UVICORN_HTTP
     )
 
     try:
@@ -51,95 +69,152 @@ def run_fastapi_server():
             port=port,
             log_level=log_level,
             workers=workers,
-            reload=reload
+            reload=reload,
+            loop=UVICORN_LOOP,
+            http=UVICORN_HTTP
         )
     except Exception as e:
         logger.error("FastAPI server error", error=str(e), exc_info=True)
         sys.exit(1)
 
 
-def run_graphql_server():
-    """Run the GraphQL server with UI"""
-    from raphtory import graphql
+def required_workers(mode: str) -> int:
+    """
+    Read WORKERS for a multi-process mode, exiting if it is not set
 
-    graphql_port = int(os.getenv("GRAPHQL_PORT", "1736"))
-    work_dir = os.getenv("GRAPHQL_WORK_DIR", "/tmp/raphtory_graphql")
+    Each worker holds its own graph, so the worker count is never defaulted.
 
-    try:
-        # Wait for FastAPI to start and initialize graph_manager
-        logger.info("Waiting for FastAPI to initialize...")
-        time.sleep(5)
+    Args:
+        mode: Command line flag of the mode, for the error message
 
-        # Import after waiting to ensure FastAPI has started
-        from api import server as api_server
+    Returns:
+        Number of worker processes
+    """
+    workers = os.getenv("WORKERS")
+    if not workers:
+        logger.error(
+            "WORKERS must be set explicitly; each worker holds its own graph",
+            mode=mode
+        )
+        sys.exit(2)
+    return int(workers)
 
-        # Create working directory
-        os.makedirs(work_dir, exist_ok=True)
 
-        logger.info(
-            "Starting Raphtory GraphQL server with UI",
-            port=graphql_port,
-            work_dir=work_dir
-        )
+def run_gunicorn() -> int:
+    """
+    Replace this process with Gunicorn running preloaded Uvicorn workers
 
-        # Create and start GraphQL server
-        graphql_server = graphql.GraphServer(work_dir)
-        handle = graphql_server.start(port=graphql_port)
-        client = handle.get_client()
+    Returns:
+        Exit code, only if Gunicorn could not be started
+    """
+    host = os.getenv("HOST", "0.0.0.0")
+    port = int(os.getenv("PORT", "8000"))
+    log_level = os.getenv("LOG_LEVEL", "info").lower()
+    # Async workers are CPU-bound, so at most one per core rather than 2 * cores + 1
+    workers = required_workers("--gunicorn")
 
-        logger.info(
-            "GraphQL server started successfully",
-            port=graphql_port,
-            ui_url=f"http://localhost:{graphql_port}/",
-            playground_url=f"http://localhost:{graphql_port}/playground"
-        )
+    logger.info(
+        "Starting Gunicorn with Uvicorn workers",
+        host=host,
+        port=port,
+        log_level=log_level,
+        workers=workers
+    )
+
+    # --preload imports the app once before forking; each worker still builds
+    # its own graph in the FastAPI startup event
+    try:
+        os.execvp("gunicorn", [
+            "gunicorn",
+            "api.server:app",
+            "--worker-class", "uvicorn.workers.UvicornWorker",
+            "--preload",
+            "--workers", str(workers),
+            "--bind", f"{host}:{port}",
+            "--log-level", log_level
+        ])
+    except OSError as e:
+        logger.error("Failed to start Gunicorn", error=str(e))
+        return 1
+
+
+def run_reuseport_workers():
+    """Run one uvicorn process per worker, each on its own SO_REUSEPORT socket"""
+    host = os.getenv("HOST", "0.0.0.0")
+    port = int(os.getenv("PORT", "8000"))
+    log_level = os.getenv("LOG_LEVEL", "info").lower()
+    workers = required_workers("--reuseport")
+    limit_concurrency = os.getenv("LIMIT_CONCURRENCY")
 
-        # Periodic graph update loop
-        update_interval = 10  # Update every 10 seconds
-        while True:
-            time.sleep(update_interval)
-
-            # Get the current graph from the FastAPI server's graph_manager
-            if api_server.graph_manager is not None and api_server.graph_manager.graph is not None:
-                try:
-                    # Send updated graph to GraphQL UI
-                    client.send_graph(
-                        path="usdt_transactions",
-                        graph=api_server.graph_manager.graph,
-                        overwrite=True
-                    )
-
-                    stats = api_server.graph_manager.get_statistics()
-                    logger.debug(
-                        "Graph updated in UI",
-                        transactions=stats.get('transaction_count', 0),
-                        nodes=stats.get('node_count', 0),
-                        edges=stats.get('edge_count', 0)
-                    )
-                except Exception as e:
-                    logger.error("Failed to update graph in UI", error=str(e))
-            else:
-                logger.debug("Graph manager not ready yet, skipping update")
+    logger.info(
+        "Starting Uvicorn workers on SO_REUSEPORT sockets",
+        host=host,
+        port=port,
+        log_level=log_level,
+        workers=workers,
+        limit_concurrency=limit_concurrency
+    )
 
-    except Exception as e:
-        logger.error(
-            "GraphQL server error",
-            error=str(e),
-            exc_info=True
-        )
+    processes = []
+    for _ in range(workers):
+        # A socket per worker lets the kernel balance connections across them
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        sock.bind((host, port))
+
+        command = [
+            sys.executable, "-m", "uvicorn", "api.server:app",
+            "--fd", str(sock.fileno()),
+            "--log-level", log_level,
+            "--loop", UVICORN_LOOP,
+            "--http", UVICORN_HTTP
+        ]
+        if limit_concurrency:
+            command += ["--limit-concurrency", limit_concurrency]
+
+        processes.append(subprocess.Popen(command, pass_fds=(sock.fileno(),)))
+        sock.close()
+
+    def stop_workers(signum, frame):
+        """Forward a termination request (e.g. container stop) to every worker"""
+        for process in processes:
+            process.terminate()
+
+    signal.signal(signal.SIGTERM, stop_workers)
+
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            process.wait()
+        logger.info("Server stopped by user")
 
 
 def main():
-    """Main function to start both servers"""
+    """Main function to start the REST API, with the GraphQL UI as a background task"""
+    if "--gunicorn" in sys.argv:
+        # Each worker holds its own graph, so there is no single graph for the UI
+        sys.exit(run_gunicorn())
+
+    if "--reuseport" in sys.argv:
+        # As with Gunicorn, each worker process holds its own graph
+        run_reuseport_workers()
+        return
+
     logger.info("Starting Raphtory service with REST API and GraphQL UI")
 
-    # Start GraphQL server in a separate thread
-    graphql_thread = threading.Thread(target=run_graphql_server, daemon=True)
-    graphql_thread.start()
+    # The API process serves the UI from its own graph. A reload subprocess
+    # inherits this through the environment; separate workers would each
+    # claim the GraphQL port, so the UI is only enabled for one worker.
+    if int(os.getenv("WORKERS", "1")) == 1:
+        os.environ.setdefault("GRAPHQL_UI", "true")
 
-    # Run FastAPI server in main thread
     try:
-        run_fastapi_server()
+        run_fastapi_server(dev="--dev" in sys.argv)
     except KeyboardInterrupt:
         logger.info("Server stopped by user")
         sys.exit(0)
@@ -2,20 +2,31 @@
 Tests for FastAPI endpoints
 """
 
+import asyncio
+import threading
+import time
 import pytest
-from fastapi.testclient import TestClient
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from api import server
+from api.models import TransactionInput
 from api.server import app
 
+pytestmark = pytest.mark.asyncio
 
-@pytest.fixture
-def client():
-    """Create test client"""
-    return TestClient(app)
 
+@pytest_asyncio.fixture
+async def client():
+    """Create one async client per test, with startup/shutdown events run"""
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as test_client:
+            yield test_client
 
-def test_health_check(client):
+
+async def test_health_check(client):
     """Test health check endpoint"""
-    response = client.get("/health")
+    response = await client.get("/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
@@ -23,7 +34,14 @@ def test_health_check(client):
     assert "graph_stats" in data
 
 
-def test_add_transaction(client):
+async def test_health_check_cached(client):
+    """Test that concurrent health checks share one cached payload"""
+    responses = await asyncio.gather(*(client.get("/health") for _ in range(5)))
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.content for response in responses}) == 1
+
+
+async def test_add_transaction(client):
     """Test adding a transaction"""
     transaction = {
         "tx_hash": "0xabc123",
@@ -35,14 +53,93 @@ def test_add_transaction(client):
         "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
     }
 
-    response = client.post("/graph/transaction", json=transaction)
+    response = await client.post("/graph/transaction", json=transaction)
     assert response.status_code == 201
     data = response.json()
     assert data["success"] is True
     assert "message" in data
 
 
-def test_get_node_info(client):
+@pytest.mark.parametrize("amount", ["abc", "1e999990", "1e10000000"])
+async def test_add_transaction_invalid_amount(client, amount):
+    """Test that a non-numeric or out-of-range amount is rejected before it is queued or stored"""
+    transaction = {
+        "tx_hash": "0xbad",
+        "from": "TFrom",
+        "to": "TTo",
+        "amount": amount,
+        "timestamp": 1704067200,
+        "block_number": 12345,
+        "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+    }
+
+    response = await client.post("/graph/transaction", json=transaction)
+    assert response.status_code == 422
+
+
+async def test_add_transaction_carries_amount_units(client):
+    """Test that the amount is parsed once by the model and its units reach the graph"""
+    transaction = TransactionInput.model_validate({
+        "tx_hash": "0xunits",
+        "from": "TUnitsFrom",
+        "to": "TUnitsTo",
+        "amount": "1.5e0",
+        "timestamp": 1704067200,
+        "block_number": 12345,
+        "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+    })
+    assert transaction.amount_units == 1_500_000
+    assert transaction.to_graph_row()["amount_units"] == 1_500_000
+
+    response = await client.post("/graph/transaction", json=transaction.model_dump(by_alias=True))
+    assert response.status_code == 201
+
+    data = (await client.get("/graph/node/TUnitsFrom")).json()
+    assert data["total_sent"] == 1.5
+
+
+async def test_add_transaction_block_number_out_of_range(client):
+    """Test that block numbers beyond 64 bits are rejected"""
+    transaction = {
+        "tx_hash": "0xbig",
+        "from": "TFrom",
+        "to": "TTo",
+        "amount": "100",
+        "timestamp": 1704067200,
+        "block_number": 2**63,
+        "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+    }
+
+    response = await client.post("/graph/transaction", json=transaction)
+    assert response.status_code == 422
+
+
+async def test_add_transactions_batch(client):
+    """Test adding a batch of transactions"""
+    batch = {
+        "transactions": [
+            {
+                "tx_hash": f"0xbatch{i}",
+                "from": "TBatchFrom",
+                "to": f"TBatchTo{i}",
+                "amount": "10",
+                "timestamp": 1704067200 + i,
+                "block_number": 12345 + i,
+                "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+            }
+            for i in range(3)
+        ]
+    }
+
+    response = await client.post("/graph/transactions", json=batch)
+    assert response.status_code == 201
+    assert response.json()["success"] is True
+
+    data = (await client.get("/graph/node/TBatchFrom")).json()
+    assert data["sent_count"] == 3
+
+
+async def test_get_node_info(client):
     """Test getting node information"""
     # First add a transaction
     transaction = {
@@ -54,10 +151,10 @@ def test_get_node_info(client):
         "block_number": 12345,
         "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
     }
-    client.post("/graph/transaction", json=transaction)
+    await client.post("/graph/transaction", json=transaction)
 
     # Get node info
-    response = client.get("/graph/node/TTestFrom")
+    response = await client.get("/graph/node/TTestFrom")
     assert response.status_code == 200
     data = response.json()
     assert data["address"] == "TTestFrom"
@@ -65,13 +162,13 @@ def test_get_node_info(client):
     assert "total_sent" in data
 
 
-def test_get_node_info_not_found(client):
+async def test_get_node_info_not_found(client):
     """Test getting info for nonexistent node"""
-    response = client.get("/graph/node/TNonexistent")
+    response = await client.get("/graph/node/TNonexistent")
     assert response.status_code == 404
 
 
-def test_get_neighbors(client):
+async def test_get_neighbors(client):
     """Test getting neighbors"""
     # Add transactions
     transactions = [
@@ -95,11 +192,10 @@ def test_get_neighbors(client):
         }
     ]
 
-    for tx in transactions:
-        client.post("/graph/transaction", json=tx)
+    await asyncio.gather(*(client.post("/graph/transaction", json=tx) for tx in transactions))
 
     # Get neighbors
-    response = client.get("/graph/neighbors/TAddr2?direction=both")
+    response = await client.get("/graph/neighbors/TAddr2?direction=both")
     assert response.status_code == 200
     data = response.json()
     assert data["address"] == "TAddr2"
@@ -108,7 +204,7 @@ def test_get_neighbors(client):
     assert "TAddr3" in data["neighbors"]
 
 
-def test_find_paths(client):
+async def test_find_paths(client):
     """Test finding paths"""
     # Add path: A -> B -> C
     transactions = [
@@ -132,11 +228,10 @@ def test_find_paths(client):
         }
     ]
 
-    for tx in transactions:
-        client.post("/graph/transaction", json=tx)
+    await asyncio.gather(*(client.post("/graph/transaction", json=tx) for tx in transactions))
 
     # Find paths
-    response = client.get("/graph/paths?from=TAddrA&to=TAddrC&max_depth=3")
+    response = await client.get("/graph/paths?from=TAddrA&to=TAddrC&max_depth=3")
     assert response.status_code == 200
     data = response.json()
     assert data["from"] == "TAddrA"
@@ -144,7 +239,7 @@ def test_find_paths(client):
     assert len(data["paths"]) > 0
 
 
-def test_get_window_transactions(client):
+async def test_get_window_transactions(client):
     """Test getting transactions in window"""
     # Add transactions
     transaction = {
@@ -156,24 +251,66 @@ def test_get_window_transactions(client):
         "block_number": 12345,
         "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
     }
-    client.post("/graph/transaction", json=transaction)
+    await client.post("/graph/transaction", json=transaction)
 
     # Query window
-    response = client.get("/graph/window?start=1704067000&end=1704067300")
+    response = await client.get("/graph/window?start=1704067000&end=1704067300")
     assert response.status_code == 200
     data = response.json()
     assert isinstance(data, list)
+    assert data == [{
+        "from": "TFrom",
+        "to": "TTo",
+        "amount": "100",
+        "tx_hash": "0xwindow",
+        "block_number": 12345,
+        "timestamp": 1704067200
+    }]
+
+
+async def test_get_window_compressed(client):
+    """Test that large window payloads are gzip-compressed"""
+    batch = {
+        "transactions": [
+            {
+                "tx_hash": f"0xgzip{i}",
+                "from": "TGzipFrom",
+                "to": "TGzipTo",
+                "amount": "100",
+                "timestamp": 1704067200 + i,
+                "block_number": 12345 + i,
+                "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+            }
+            for i in range(50)
+        ]
+    }
+    await client.post("/graph/transactions", json=batch)
+
+    response = await client.get(
+        "/graph/window?start=1704067000&end=1704067300",
+        headers={"Accept-Encoding": "gzip"}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 50
 
 
-def test_get_window_invalid_range(client):
+async def test_get_window_invalid_range(client):
     """Test invalid time range"""
-    response = client.get("/graph/window?start=1704067300&end=1704067000")
+    response = await client.get("/graph/window?start=1704067300&end=1704067000")
     assert response.status_code == 400
 
 
-def test_get_statistics(client):
+@pytest.mark.parametrize("query", ["start=-1&end=1704067000", f"start=0&end={2**63}"])
+async def test_get_window_out_of_range(client, query):
+    """Test that window bounds outside 64-bit timestamps are rejected"""
+    response = await client.get(f"/graph/window?{query}")
+    assert response.status_code == 422
+
+
+async def test_get_statistics(client):
     """Test getting graph statistics"""
-    response = client.get("/graph/statistics")
+    response = await client.get("/graph/statistics")
     assert response.status_code == 200
     data = response.json()
     assert "node_count" in data
@@ -181,7 +318,7 @@ def test_get_statistics(client):
     assert "transaction_count" in data
 
 
-def test_clear_graph(client):
+async def test_clear_graph(client):
     """Test clearing the graph"""
     # Add a transaction first
     transaction = {
@@ -193,14 +330,63 @@ def test_clear_graph(client):
         "block_number": 12345,
         "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
     }
-    client.post("/graph/transaction", json=transaction)
+    await client.post("/graph/transaction", json=transaction)
 
     # Clear
-    response = client.delete("/graph/clear")
+    response = await client.delete("/graph/clear")
     assert response.status_code == 200
     data = response.json()
     assert data["success"] is True
 
     # Verify it's cleared
-    stats = client.get("/graph/statistics").json()
+    stats = (await client.get("/graph/statistics")).json()
     assert stats["transaction_count"] == 0
+
+
+async def test_drain_ingest_queue_cancel_during_insert(monkeypatch):
+    """Test that shutdown during a batch insert neither repeats nor drops it"""
+    started = threading.Event()
+    inserted = []
+
+    class SlowGraphManager:
+        def add_transactions_bulk(self, batch):
+            started.set()
+            time.sleep(0.2)
+            inserted.append([tx["tx_hash"] for tx in batch])
+            return True
+
+    monkeypatch.setattr(server, "graph_manager", SlowGraphManager())
+    monkeypatch.setattr(server, "ingest_queue", asyncio.Queue())
+    monkeypatch.setattr(server, "INGEST_FLUSH_MS", 0)
+
+    task = asyncio.create_task(server._drain_ingest_queue())
+    await server.ingest_queue.put({"tx_hash": "0x1"})
+    while not started.is_set():
+        await asyncio.sleep(0.01)
+    await server.ingest_queue.put({"tx_hash": "0x2"})
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert inserted == [["0x1"], ["0x2"]]
+
+
+async def test_insert_batch_retries_rows(monkeypatch):
+    """Test that a failed batch insert falls back to inserting rows one by one"""
+    inserted = []
+
+    class FailingGraphManager:
+        def add_transactions_bulk(self, batch):
+            return False
+
+        def add_transaction(self, **transaction):
+            if transaction["tx_hash"] == "0xbad":
+                return False
+            inserted.append(transaction["tx_hash"])
+            return True
+
+    monkeypatch.setattr(server, "graph_manager", FailingGraphManager())
+    await server._insert_batch([{"tx_hash": "0x1"}, {"tx_hash": "0xbad"}, {"tx_hash": "0x2"}])
+
+    assert inserted == ["0x1", "0x2"]
@@ -3,6 +3,8 @@ Tests for GraphManager
 """
 
 import pytest
+from graph import graph_manager as graph_manager_module
+from graph.amounts import to_amount_units
 from graph.graph_manager import GraphManager
 
 
@@ -73,6 +75,59 @@ def test_add_multiple_transactions(graph_manager):
     assert stats["edge_count"] == 3
 
 
+def test_add_transactions_bulk(graph_manager):
+    """Test adding a batch of transactions in one call"""
+    transactions = [
+        {
+            "tx_hash": f"0x{i}",
+            "from_address": "TAddr1",
+            "to_address": to_addr,
+            "amount": "10.5",
+            "timestamp": 1704067200 + i * 60,
+            "block_number": 12345 + i,
+            "contract": "TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+        }
+        for i, to_addr in enumerate(["TAddr2", "TAddr3", "TAddr2"])
+    ]
+
+    assert graph_manager.add_transactions_bulk(transactions) is True
+
+    stats = graph_manager.get_statistics()
+    assert stats["transaction_count"] == 3
+    assert stats["node_count"] == 3
+
+    info = graph_manager.get_node_info("TAddr1")
+    assert info["sent_count"] == 3
+    assert info["total_sent"] == 31.5
+    assert sorted(graph_manager.get_neighbors("TAddr1", direction="out")) == ["TAddr2", "TAddr3"]
+
+    txs = graph_manager.get_transactions_in_window(1704067200, 1704067400)
+    assert sorted(tx["tx_hash"] for tx in txs) == ["0x0", "0x1", "0x2"]
+
+
+def test_add_transaction_out_of_range_leaves_no_partial_state(graph_manager):
+    """Test that values too large for the index are rejected before any write"""
+    kwargs = dict(
+        tx_hash="0xbig",
+        from_address="TFrom",
+        to_address="TTo",
+        amount="100",
+        timestamp=1704067200,
+        block_number=2**63,
+        contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+    )
+    assert graph_manager.add_transaction(**kwargs) is False
+    assert graph_manager.add_transactions_bulk([
+        {**kwargs, "tx_hash": "0xok", "block_number": 1},
+        kwargs
+    ]) is False
+
+    stats = graph_manager.get_statistics()
+    assert stats["transaction_count"] == 0
+    assert stats["edge_count"] == 0
+    assert len(graph_manager._tx_times) == len(graph_manager._tx_blocks) == 0
+
+
 def test_get_node_info(graph_manager):
     """Test getting node information"""
     # Add transaction
@@ -103,6 +158,36 @@ def test_get_node_info(graph_manager):
     assert to_info["total_received"] == 100.5
 
 
+def test_get_node_info_repeat_transfers(graph_manager):
+    """Test that node info aggregates every transfer, including repeats"""
+    transfers = [
+        ("0x1", "TFromAddr", "TToAddr", "100.5", 1704067260),
+        ("0x2", "TFromAddr", "TToAddr", "20", 1704067200),
+        ("0x3", "TToAddr", "TFromAddr", "10", 1704067320),
+    ]
+
+    for tx_hash, from_addr, to_addr, amount, timestamp in transfers:
+        graph_manager.add_transaction(
+            tx_hash=tx_hash,
+            from_address=from_addr,
+            to_address=to_addr,
+            amount=amount,
+            timestamp=timestamp,
+            block_number=12345,
+            contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+        )
+
+    info = graph_manager.get_node_info("TFromAddr")
+    assert info["sent_count"] == 2
+    assert info["received_count"] == 1
+    assert info["transaction_count"] == 3
+    assert info["total_sent"] == 120.5
+    assert info["total_received"] == 10
+    assert info["balance_flow"] == -110.5
+    assert info["first_seen"] == 1704067200
+    assert info["last_seen"] == 1704067320
+
+
 def test_get_node_info_nonexistent(graph_manager):
     """Test getting info for nonexistent node"""
     info = graph_manager.get_node_info("TNonexistent")
@@ -174,6 +259,74 @@ def test_find_paths(graph_manager):
     assert ["TAddrA", "TAddrB", "TAddrC", "TAddrD"] in paths
 
 
+def test_find_paths_multiple_shortest(graph_manager):
+    """Test that every shortest path is returned and max_depth is respected"""
+    # Diamond: A -> B -> D and A -> C -> D, plus a longer A -> E -> F -> D
+    transactions = [
+        ("0x1", "TAddrA", "TAddrB"),
+        ("0x2", "TAddrA", "TAddrC"),
+        ("0x3", "TAddrB", "TAddrD"),
+        ("0x4", "TAddrC", "TAddrD"),
+        ("0x5", "TAddrA", "TAddrE"),
+        ("0x6", "TAddrE", "TAddrF"),
+        ("0x7", "TAddrF", "TAddrD"),
+    ]
+
+    for i, (tx_hash, from_addr, to_addr) in enumerate(transactions):
+        graph_manager.add_transaction(
+            tx_hash=tx_hash,
+            from_address=from_addr,
+            to_address=to_addr,
+            amount="100",
+            timestamp=1704067200 + i * 60,
+            block_number=12345 + i,
+            contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+        )
+
+    paths = graph_manager.find_paths("TAddrA", "TAddrD", max_depth=5)
+    assert sorted(paths) == [
+        ["TAddrA", "TAddrB", "TAddrD"],
+        ["TAddrA", "TAddrC", "TAddrD"],
+    ]
+
+    # Path of 3 addresses does not fit in max_depth=2
+    assert graph_manager.find_paths("TAddrA", "TAddrD", max_depth=2) == []
+
+    # No path against edge direction
+    assert graph_manager.find_paths("TAddrD", "TAddrA", max_depth=5) == []
+
+
+def test_find_paths_sees_new_transactions(graph_manager):
+    """Test that path queries reflect transactions added after a previous query"""
+    for tx_hash, from_addr, to_addr in [("0x1", "TAddrA", "TAddrB"), ("0x2", "TAddrC", "TAddrD")]:
+        graph_manager.add_transaction(
+            tx_hash=tx_hash,
+            from_address=from_addr,
+            to_address=to_addr,
+            amount="100",
+            timestamp=1704067200,
+            block_number=12345,
+            contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+        )
+
+    assert graph_manager.find_paths("TAddrA", "TAddrD", max_depth=5) == []
+
+    graph_manager.add_transaction(
+        tx_hash="0x3",
+        from_address="TAddrB",
+        to_address="TAddrC",
+        amount="100",
+        timestamp=1704067260,
+        block_number=12346,
+        contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+    )
+
+    assert graph_manager.find_paths("TAddrA", "TAddrD", max_depth=5) == [
+        ["TAddrA", "TAddrB", "TAddrC", "TAddrD"]
+    ]
+    assert sorted(graph_manager.get_neighbors("TAddrB")) == ["TAddrA", "TAddrC"]
+
+
 def test_get_transactions_in_window(graph_manager):
     """Test getting transactions in a time window"""
     # Add transactions with different timestamps
@@ -206,6 +359,95 @@ def test_get_transactions_in_window(graph_manager):
     assert len(txs) >= 2
 
 
+def test_get_transactions_in_window_out_of_order(graph_manager):
+    """Test window queries over transactions ingested out of time order"""
+    for tx_hash, timestamp in [("0x3", 1704067320), ("0x1", 1704067200), ("0x4", 1704067380), ("0x2", 1704067260)]:
+        graph_manager.add_transaction(
+            tx_hash=tx_hash,
+            from_address="TFrom",
+            to_address="TTo",
+            amount="100",
+            timestamp=timestamp,
+            block_number=12345,
+            contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+        )
+
+    # End of the window is exclusive
+    txs = graph_manager.get_transactions_in_window(1704067200, 1704067320)
+    assert [tx["tx_hash"] for tx in txs] == ["0x1", "0x2"]
+    assert txs[0] == {
+        "from": "TFrom",
+        "to": "TTo",
+        "amount": "100",
+        "tx_hash": "0x1",
+        "block_number": 12345,
+        "timestamp": 1704067200
+    }
+
+    txs = graph_manager.get_transactions_in_window(1704067260, 1704070000, limit=2)
+    assert [tx["tx_hash"] for tx in txs] == ["0x2", "0x3"]
+
+
+def test_get_transactions_in_window_backfill(graph_manager, monkeypatch):
+    """Test a backfill of late transactions merged into the window index in batches"""
+    monkeypatch.setattr(graph_manager_module, "LATE_MERGE_MIN_ROWS", 3)
+    # A live tip, then older history arriving newest block first, with a tie
+    order = [20, 21] + list(range(19, -1, -1)) + [5]
+    for i, minute in enumerate(order):
+        graph_manager.add_transaction(
+            tx_hash=f"0x{i}",
+            from_address="TFrom",
+            to_address="TTo",
+            amount="100",
+            timestamp=1704067200 + minute * 60,
+            block_number=12345 + minute,
+            contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+        )
+
+    txs = graph_manager.get_transactions_in_window(1704067200, 1704070000)
+    assert [tx["timestamp"] for tx in txs] == sorted(1704067200 + m * 60 for m in order)
+    assert [tx["block_number"] - 12345 for tx in txs] == [(tx["timestamp"] - 1704067200) // 60 for tx in txs]
+    # Equal timestamps keep arrival order
+    assert [tx["tx_hash"] for tx in txs if tx["timestamp"] == 1704067200 + 5 * 60] == ["0x16", "0x22"]
+    assert graph_manager._late == []
+
+
+def test_get_transactions_in_window_bounded_index():
+    """Test window queries that reach past the evicted part of a bounded index"""
+    graph_manager = GraphManager(persistent=False, window_limit=4)
+    for i in range(10):
+        graph_manager.add_transaction(
+            tx_hash=f"0x{i}",
+            from_address="TFrom",
+            to_address=f"TTo{i}",
+            amount="100",
+            timestamp=1704067200 + i * 60,
+            block_number=12345 + i,
+            contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+        )
+
+    assert len(graph_manager._tx_times) <= 5
+    assert graph_manager.get_statistics()["transaction_count"] == 10
+
+    # Evicted transactions are read back from the graph, in time order
+    txs = graph_manager.get_transactions_in_window(1704067200, 1704070000)
+    assert [tx["tx_hash"] for tx in txs] == [f"0x{i}" for i in range(10)]
+    assert txs[0] == {
+        "from": "TFrom",
+        "to": "TTo0",
+        "amount": "100",
+        "tx_hash": "0x0",
+        "block_number": 12345,
+        "timestamp": 1704067200
+    }
+
+    txs = graph_manager.get_transactions_in_window(1704067200, 1704070000, limit=3)
+    assert [tx["tx_hash"] for tx in txs] == ["0x0", "0x1", "0x2"]
+
+    txs = graph_manager.get_transactions_in_window(1704067200 + 8 * 60, 1704070000)
+    assert [tx["tx_hash"] for tx in txs] == ["0x8", "0x9"]
+
+
 def test_clear_graph(graph_manager):
     """Test clearing the graph"""
     # Add transaction
@@ -241,3 +483,41 @@ def test_get_statistics(graph_manager):
     assert "transaction_count" in stats
     assert "persistent" in stats
     assert stats["persistent"] is False
+
+
+def test_wait_for_changes(graph_manager):
+    """Test that the change flag is set by writes and reset once observed"""
+    assert graph_manager.wait_for_changes(timeout=0) is False
+
+    graph_manager.add_transaction(
+        tx_hash="0xabc123",
+        from_address="TFrom",
+        to_address="TTo",
+        amount="100",
+        timestamp=1704067200,
+        block_number=12345,
+        contract="TR7NHqjeKQxGTCi8q8ZY4pL8otSzgjLj6t"
+    )
+
+    assert graph_manager.wait_for_changes(timeout=0) is True
+    assert graph_manager.wait_for_changes(timeout=0) is False
+
+
+@pytest.mark.parametrize("amount, units", [
+    ("100.50", 100_500_000),
+    ("100", 100_000_000),
+    ("-1.5", -1_500_000),
+    ("0.0000019", 1),
+    (".5", 500_000),
+    ("1e3", 1_000_000_000),
+])
+def test_to_amount_units(amount, units):
+    """Test parsing amount strings into integer micro-USDT units"""
+    assert to_amount_units(amount) == units
+
+
+@pytest.mark.parametrize("amount", ["1e999990", "1e10000000", "NaN", "-Infinity"])
+def test_to_amount_units_rejects_out_of_range(amount):
+    """Test that huge exponents and non-finite amounts fail fast"""
+    with pytest.raises(ValueError):
+        to_amount_units(amount)
@@ -0,0 +1,18 @@
+"""
+Tests for logging configuration
+"""
+
+import orjson
+import logging_config
+
+
+def test_render_falls_back_for_values_orjson_rejects():
+    """Test that an event orjson cannot encode is still written as one JSON line"""
+    line = logging_config._render({"event": "Big value", "value": 2 ** 70})
+    assert line.endswith(b"\n")
+    assert orjson.loads(line) == {"event": "Big value", "value": str(2 ** 70)}
+
+
+def test_render_plain_event():
+    """Test rendering an ordinary event dict"""
+    assert logging_config._render({"event": "Started", "count": 3}) == b'{"event":"Started","count":3}\n'